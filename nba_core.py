@@ -0,0 +1,406 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import orjson
+import pandas as pd
+import requests
+import streamlit as st
+from numba import njit, prange
+from scipy.special import ndtr
+
+ESPN_ABBR_TO_FULL = {
+    "ATL":"Atlanta Hawks",
+    "BOS":"Boston Celtics",
+    "BKN":"Brooklyn Nets",
+    "CHA":"Charlotte Hornets",
+    "CHI":"Chicago Bulls",
+    "CLE":"Cleveland Cavaliers",
+    "DAL":"Dallas Mavericks",
+    "DEN":"Denver Nuggets",
+    "DET":"Detroit Pistons",
+    "GS":"Golden State Warriors",
+    "GSW":"Golden State Warriors",
+    "HOU":"Houston Rockets",
+    "IND":"Indiana Pacers",
+    "LAC":"LA Clippers",
+    "LAL":"Los Angeles Lakers",
+    "MEM":"Memphis Grizzlies",
+    "MIA":"Miami Heat",
+    "MIL":"Milwaukee Bucks",
+    "MIN":"Minnesota Timberwolves",
+    "NO":"New Orleans Pelicans",
+    "NOP":"New Orleans Pelicans",
+    "NY":"New York Knicks",
+    "NYK":"New York Knicks",
+    "OKC":"Oklahoma City Thunder",
+    "ORL":"Orlando Magic",
+    "PHI":"Philadelphia 76ers",
+    "PHX":"Phoenix Suns",
+    "POR":"Portland Trail Blazers",
+    "SAC":"Sacramento Kings",
+    "SA":"San Antonio Spurs",
+    "SAS":"San Antonio Spurs",
+    "TOR":"Toronto Raptors",
+    "UTA":"Utah Jazz",
+    "WAS":"Washington Wizards",
+}
+
+default_team = {"off": 114, "def": 114, "pace": 100, "volatility": 1.0}
+
+# ---------------------------------------------------
+# Ratings + Slate Loading
+# ---------------------------------------------------
+def normalize_team_name(name: str) -> str:
+    return (name or "").strip().lower()
+
+@st.cache_data
+def load_json(path: str, mtime: float):
+    # mtime is only part of the cache key: editing the file invalidates the entry
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+def load_ratings(path: str):
+    return load_json(path, os.path.getmtime(path))
+
+@st.cache_data
+def build_teams_df(ratings):
+    # One row per team, missing ratings filled from default_team
+    return (
+        pd.DataFrame.from_dict(ratings, orient="index")
+        .reindex(columns=list(default_team))
+        .fillna(default_team)
+    )
+
+@st.cache_data
+def build_players_df(ratings):
+    # One row per player with numeric stat columns; missing stats become 0
+    df = pd.DataFrame.from_dict(ratings, orient="index")
+    stats = (
+        df.reindex(columns=["pts", "reb", "ast", "3pm", "usage"])
+        .apply(pd.to_numeric, errors="coerce")
+        .fillna(0.0)
+    )
+    stats.insert(0, "team", df.get("team", pd.Series("", index=df.index)).fillna(""))
+    return stats
+
+@st.cache_data
+def build_team_index(ratings):
+    # normalized team name -> players, so a game's roster is two dict lookups
+    index = {}
+    for name, d in ratings.items():
+        index.setdefault(normalize_team_name(d.get("team")), []).append(name)
+    return index
+
+@st.cache_data(ttl=300)
+def fetch_scoreboard_nba_api(game_date: str):
+    from nba_api.stats.endpoints import scoreboardv3
+    # Retry only network errors, backing off 1.5s/3s between attempts; anything
+    # else (bad payload etc.) surfaces immediately so the caller can fall back to ESPN.
+    for attempt in range(3):
+        try:
+            return ("nba_api", scoreboardv3.ScoreboardV3(game_date=game_date, timeout=60).get_dict())
+        except requests.RequestException:
+            if attempt == 2:
+                raise
+            time.sleep(1.5 * 2 ** attempt)
+
+
+@st.cache_data(ttl=300)
+def fetch_scoreboard_espn(game_date: str):
+    date_compact = game_date.replace("-", "")
+    url = f"https://site.web.api.espn.com/apis/v2/sports/basketball/nba/scoreboard?dates={date_compact}"
+    r = requests.get(url, timeout=20)
+    r.raise_for_status()
+    return ("espn", r.json())
+
+
+def get_today_games(source, scoreboard, tz):
+    """Turn an nba_api or ESPN scoreboard into ("Away @ Home (status)" labels, label -> metadata)."""
+    games = []
+    game_meta = {}  # label -> metadata for later use
+
+    if source == "nba_api":
+        game_objects = scoreboard.get("scoreboard", {}).get("games", [])
+        for g in game_objects:
+            home = g.get("homeTeam", {}).get("teamName")
+            away = g.get("awayTeam", {}).get("teamName")
+            status = g.get("gameStatusText", "")
+            if home and away:
+                label = f"{away} @ {home} ({status})"
+                games.append(label)
+                game_meta[label] = g
+
+    elif source == "espn":
+        # ESPN format: events -> competitions -> competitors
+        for ev in scoreboard.get("events", []):
+            comps = ev.get("competitions", [])
+            if not comps:
+                continue
+
+            comp = comps[0]
+            competitors = comp.get("competitors", [])
+            if len(competitors) < 2:
+                continue
+
+            # Identify home/away
+            home_comp = next((c for c in competitors if c.get("homeAway") == "home"), None)
+            away_comp = next((c for c in competitors if c.get("homeAway") == "away"), None)
+            if not home_comp or not away_comp:
+                continue
+
+            home_abbr = home_comp.get("team", {}).get("abbreviation")
+            away_abbr = away_comp.get("team", {}).get("abbreviation")
+
+            home = ESPN_ABBR_TO_FULL.get(home_abbr, home_comp.get("team", {}).get("displayName"))
+            away = ESPN_ABBR_TO_FULL.get(away_abbr, away_comp.get("team", {}).get("displayName"))
+
+            # Status/time
+            status_text = ev.get("status", {}).get("type", {}).get("shortDetail") or ev.get("status", {}).get("type", {}).get("description", "")
+            # Start time in ISO
+            dt_str = comp.get("date", ev.get("date", ""))  # ISO
+            time_ct = ""
+            if dt_str:
+                try:
+                    dt_str = dt_str.replace("Z", "+00:00")
+                    dt_utc = datetime.fromisoformat(dt_str)
+                    dt_ct = dt_utc.astimezone(tz)
+                    time_ct = dt_ct.strftime("%-I:%M %p CT")
+                except Exception:
+                    time_ct = ""
+
+            # Prefer time if scheduled; otherwise status text (live/final)
+            label_tail = time_ct if time_ct else status_text
+            label = f"{away} @ {home} ({label_tail})"
+
+            games.append(label)
+            game_meta[label] = {
+                "homeTeam": {"teamName": home, "score": home_comp.get("score")},
+                "awayTeam": {"teamName": away, "score": away_comp.get("score")},
+                "statusText": status_text,
+                "startTime": dt_str,
+                "homeAbbr": home_abbr,
+                "awayAbbr": away_abbr,
+            }
+
+    return games, game_meta
+
+@st.cache_data
+def build_usage_context(home_team, away_team, ratings_path, mtime):
+    """Per-game rosters plus usage/team Series, keyed on the teams and the ratings file mtime."""
+    ratings = load_json(ratings_path, mtime)
+    index = build_team_index(ratings)
+    home_players = index.get(normalize_team_name(home_team), [])
+    away_players = index.get(normalize_team_name(away_team), [])
+    players = home_players + away_players
+    usage = pd.Series({p: float(ratings[p].get("usage", 0.0)) for p in players}, dtype=float)
+    player_team = pd.Series({p: ratings[p]["team"] for p in players}, dtype=object)
+    return home_players, away_players, usage, player_team
+
+@njit(cache=True)
+def redistribute_lost_usage(usage, keep, healthy, team_codes, n_teams):
+    # Each player keeps usage * keep; each team's lost usage goes to its healthy players
+    # in proportion to their usage (equal split if they have none).
+    adjusted = usage * keep
+    lost = np.zeros(n_teams)
+    healthy_total = np.zeros(n_teams)
+    healthy_count = np.zeros(n_teams)
+    for i in range(usage.size):
+        t = team_codes[i]
+        lost[t] += usage[i] - adjusted[i]
+        if healthy[i]:
+            healthy_total[t] += adjusted[i]
+            healthy_count[t] += 1.0
+
+    for i in range(usage.size):
+        t = team_codes[i]
+        if not healthy[i]:
+            continue
+        if healthy_total[t] > 0:
+            adjusted[i] += lost[t] * adjusted[i] / healthy_total[t]
+        else:
+            adjusted[i] += lost[t] / healthy_count[t]
+    return adjusted
+
+# ---------------------------------------------------
+# Pricing + Projections
+# ---------------------------------------------------
+def american_to_profit(odds):
+    # Profit per 1 unit staked; branchless so a whole slate of odds converts in one call.
+    # Odds strictly between -100 and +100 aren't valid American odds and map to NaN.
+    odds = np.asarray(odds, dtype=float)
+    profit = np.full(odds.shape, np.nan)
+    np.divide(odds, 100.0, out=profit, where=odds >= 100)
+    np.divide(100.0, -odds, out=profit, where=odds <= -100)
+    return profit if profit.ndim else float(profit)
+
+def calculate_ev(prob: float, odds: int) -> float:
+    profit = american_to_profit(odds)
+    return (prob * profit) - (1 - prob)
+
+# Per-stat usage sensitivity and base SD (scaled by team volatility) for the independent prop model
+STAT_USAGE_COEF = {"ast": 0.7, "reb": 0.25, "3pm": 0.4}
+# Combo stats are projected as the sum of their components' projections
+STAT_COMPONENTS = {"PRA": ("pts", "reb", "ast")}
+STAT_SD = {"3pm": 1.2, "ast": 2.2, "reb": 2.6}
+
+def get_team_sd(mean_points: float) -> float:
+    base_sd = 11.0
+    return base_sd * (mean_points / 110.0)
+
+def linear_marginal(weights, means, cov):
+    # w·X of a Gaussian vector X is univariate normal with mean w·mu and var wᵀΣw
+    w = np.asarray(weights, dtype=float)
+    return float(w @ means), float(np.sqrt(w @ cov @ w))
+
+def normal_over_probs(proj, sd, line):
+    # P(X >= line) for X ~ Normal(proj, sd), elementwise over players
+    return ndtr((np.asarray(proj, dtype=float) - line) / np.asarray(sd, dtype=float))
+
+# League scale (112 pts at 114 off/def, pace 100) and home edge folded into one constant per side
+AWAY_MEAN_K = 112.0 * 0.975 / (114.0 * 114.0 * 100.0)
+HOME_MEAN_K = 112.0 * 1.025 / (114.0 * 114.0 * 100.0)
+
+def project_team_means(away_data, home_data):
+    """Projected (away, home) points. Columns are taken positionally, so dicts score one
+    game and teams_df slices of the away and home teams (one row per game) score a slate."""
+    away_off, away_def, away_pace = (np.asarray(away_data[k], dtype=float) for k in ("off", "def", "pace"))
+    home_off, home_def, home_pace = (np.asarray(home_data[k], dtype=float) for k in ("off", "def", "pace"))
+    avg_pace = (away_pace + home_pace) / 2.0
+    away_mean = AWAY_MEAN_K * away_off * home_def * avg_pace
+    home_mean = HOME_MEAN_K * home_off * away_def * avg_pace
+    if away_mean.ndim == 0:
+        return float(away_mean), float(home_mean)
+    return away_mean, home_mean
+
+# ---------------------------------------------------
+# Simulation
+# ---------------------------------------------------
+@njit(parallel=True, fastmath=True, cache=True)
+def prop_over_probs(proj, sd, line, n_sims, seed):
+    # One player per thread, each keeping a running count instead of a sample array
+    n_players = proj.shape[0]
+    out = np.empty(n_players)
+    for i in prange(n_players):
+        # Per-player seed keeps results independent of thread scheduling
+        np.random.seed(seed + i)
+        hits = 0
+        for _ in range(n_sims):
+            if proj[i] + sd[i] * np.random.standard_normal() >= line:
+                hits += 1
+        out[i] = hits / n_sims
+    return out
+
+def draw_game_scores(home_mean, away_mean, home_sd, away_sd, rho, n, seed):
+    # Closed-form 2x2 Cholesky: two independent normals mixed by rho.
+    # float32 is plenty for scores with SD ~11 and halves the draw + cache footprint.
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal((n, 2), dtype=np.float32)
+    f32 = np.float32
+    home_scores = f32(home_mean) + f32(home_sd) * z[:, 0]
+    away_scores = f32(away_mean) + f32(away_sd) * (f32(rho) * z[:, 0] + f32(np.sqrt(1 - rho * rho)) * z[:, 1])
+    return home_scores, away_scores
+
+# Scoring responds to extra usage sublinearly (sqrt of the usage ratio) and boundedly:
+# absorbing a star's usage lifts a teammate at most 35%, and nobody expects more
+# than 40% of their team's points.
+MAX_USAGE_BOOST = 1.35
+MAX_PLAYER_SHARE = 0.40
+
+def team_constrained_points_sims(team_points_sims, team_players, ratings, usage_map_local, concentration=90, rng=None, mean_points=None):
+    """Split every simulated team score across its players in one batched Dirichlet draw.
+
+    Returns an (n_sims, len(team_players)) matrix. Expected shares come from each
+    player's scoring average (scaled by a bounded response to any usage change); whatever
+    is left over goes to an implicit "rest of roster" bucket so an incomplete JSON
+    doesn't over-allocate.
+    """
+    team_points_sims = np.asarray(team_points_sims, dtype=float)
+    if not team_players:
+        return np.zeros((len(team_points_sims), 0))
+
+    pts = np.array([float(ratings[p].get("pts", 0.0)) for p in team_players])
+    orig = np.array([float(ratings[p].get("usage", 0.0)) for p in team_players])
+    adj = np.array([float(usage_map_local.get(p, 0.0)) for p in team_players])
+    usage_ratio = np.divide(adj, orig, out=np.ones_like(adj), where=orig > 0)
+
+    if mean_points is None:
+        mean_points = float(np.mean(team_points_sims))
+    usage_boost = np.minimum(np.sqrt(usage_ratio), MAX_USAGE_BOOST)
+    shares = np.minimum(pts * usage_boost / max(mean_points, 1e-9), MAX_PLAYER_SHARE)
+    if shares.sum() >= 1.0:
+        shares = 0.999 * shares / shares.sum()
+
+    alpha = concentration * np.append(shares, 1.0 - shares.sum())
+    alpha = np.maximum(alpha, 1e-3)  # Dirichlet needs strictly positive params (Out players)
+    if rng is None:
+        rng = np.random.default_rng()
+    weights = rng.dirichlet(alpha, size=len(team_points_sims))[:, :-1]
+    return weights * team_points_sims[:, None]
+
+SIM_CHUNK = 4096
+
+def team_points_prop_probs(team_points_sims, team_players, ratings, usage_map_local, line, concentration=90, rng=None):
+    """Mean points and P(points >= line) per player, allocated SIM_CHUNK sims at a time.
+
+    Only running sums/counts are kept, so the full (n_sims, P) allocation matrix
+    is never materialized.
+    """
+    team_points_sims = np.asarray(team_points_sims, dtype=float)
+    mean_points = float(np.mean(team_points_sims))
+    pts_sum = np.zeros(len(team_players))
+    hits = np.zeros(len(team_players))
+    for start in range(0, len(team_points_sims), SIM_CHUNK):
+        chunk = team_constrained_points_sims(
+            team_points_sims[start:start + SIM_CHUNK], team_players, ratings, usage_map_local,
+            concentration=concentration, rng=rng, mean_points=mean_points,
+        )
+        pts_sum += chunk.sum(axis=0)
+        hits += (chunk >= line).sum(axis=0)
+    n = max(len(team_points_sims), 1)
+    return pts_sum / n, hits / n
+
+# Each entry holds the score arrays (or props) for one game/seed/n_sims combination,
+# so keep only the most recent ones instead of growing for the life of the server
+SIM_CACHE_ENTRIES = 32
+
+@st.cache_data(max_entries=SIM_CACHE_ENTRIES)
+def simulate_game(home_mean, away_mean, home_sd, away_sd, rho, n_sims, seed=0):
+    return draw_game_scores(home_mean, away_mean, home_sd, away_sd, rho, n_sims, seed)
+
+# Streamlit runs each session's script in its own thread, and numba's workqueue
+# threading layer (the fallback without tbb/omp) aborts the process on concurrent
+# parallel launches. The kernel already uses every core, so serializing costs nothing.
+PROP_KERNEL_LOCK = threading.Lock()
+
+@st.cache_data(max_entries=SIM_CACHE_ENTRIES)
+def simulate_prop_over_probs(proj, sd, line, n_sims, seed=0):
+    # Parallel numba kernel over players; no (n_sims, P) sample matrix
+    proj = np.ascontiguousarray(proj, dtype=np.float64)
+    sd = np.ascontiguousarray(sd, dtype=np.float64)
+    with PROP_KERNEL_LOCK:
+        return prop_over_probs(proj, sd, float(line), int(n_sims), int(seed))
+
+@st.cache_data(max_entries=SIM_CACHE_ENTRIES)
+def simulate_pts_props(home_mean, away_mean, home_sd, away_sd, rho, n_sims, seed,
+                       home_players, away_players, ratings, usage_map_local, line,
+                       coverage=0.90, concentration=90):
+    """Team-constrained PTS props: (mean points, P(points >= line)) for home + away players.
+
+    Cached on the game and allocation inputs, so changing only the odds is a cache hit.
+    """
+    home_scores, away_scores = simulate_game(
+        home_mean, away_mean, home_sd, away_sd, rho, n_sims, seed
+    )
+
+    # Separate stream from the score draw, still reproducible from the same seed
+    alloc_rng = np.random.default_rng([seed, 1])
+    home_proj, home_over = team_points_prop_probs(
+        home_scores * coverage, home_players, ratings, usage_map_local, line, concentration=concentration, rng=alloc_rng
+    )
+    away_proj, away_over = team_points_prop_probs(
+        away_scores * coverage, away_players, ratings, usage_map_local, line, concentration=concentration, rng=alloc_rng
+    )
+    return np.concatenate([home_proj, away_proj]), np.concatenate([home_over, away_over])
@@ -1,111 +1,52 @@
 import streamlit as st
-import json
+import os
 import numpy as np
 import pandas as pd
-import requests
-import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
-import pytz
-def normalize_team_name(name: str) -> str:
-    return (name or "").strip().lower()
-from nba_api.stats.endpoints import scoreboardv3
-
-ESPN_ABBR_TO_FULL = {
-    "ATL":"Atlanta Hawks",
-    "BOS":"Boston Celtics",
-    "BKN":"Brooklyn Nets",
-    "CHA":"Charlotte Hornets",
-    "CHI":"Chicago Bulls",
-    "CLE":"Cleveland Cavaliers",
-    "DAL":"Dallas Mavericks",
-    "DEN":"Denver Nuggets",
-    "DET":"Detroit Pistons",
-    "GS":"Golden State Warriors",
-    "GSW":"Golden State Warriors",
-    "HOU":"Houston Rockets",
-    "IND":"Indiana Pacers",
-    "LAC":"LA Clippers",
-    "LAL":"Los Angeles Lakers",
-    "MEM":"Memphis Grizzlies",
-    "MIA":"Miami Heat",
-    "MIL":"Milwaukee Bucks",
-    "MIN":"Minnesota Timberwolves",
-    "NO":"New Orleans Pelicans",
-    "NOP":"New Orleans Pelicans",
-    "NY":"New York Knicks",
-    "NYK":"New York Knicks",
-    "OKC":"Oklahoma City Thunder",
-    "ORL":"Orlando Magic",
-    "PHI":"Philadelphia 76ers",
-    "PHX":"Phoenix Suns",
-    "POR":"Portland Trail Blazers",
-    "SAC":"Sacramento Kings",
-    "SA":"San Antonio Spurs",
-    "SAS":"San Antonio Spurs",
-    "TOR":"Toronto Raptors",
-    "UTA":"Utah Jazz",
-    "WAS":"Washington Wizards",
-}
-
-@st.cache_data(ttl=300)
-def fetch_scoreboard_nba_api(game_date: str):
-    from nba_api.stats.endpoints import scoreboardv3
-    last_err = None
-    for _ in range(3):
-        try:
-            return ("nba_api", scoreboardv3.ScoreboardV3(game_date=game_date, timeout=60).get_dict())
-        except Exception as e:
-            last_err = e
-            time.sleep(1.5)
-    raise last_err
-
-
-@st.cache_data(ttl=300)
-def fetch_scoreboard_espn(game_date: str):
-    date_compact = game_date.replace("-", "")
-    url = f"https://site.web.api.espn.com/apis/v2/sports/basketball/nba/scoreboard?dates={date_compact}"
-    r = requests.get(url, timeout=20)
-    r.raise_for_status()
-    return ("espn", r.json())
-    
+from nba_core import (
+    STAT_COMPONENTS,
+    STAT_SD,
+    STAT_USAGE_COEF,
+    american_to_profit,
+    build_players_df,
+    build_teams_df,
+    build_usage_context,
+    calculate_ev,
+    default_team,
+    fetch_scoreboard_espn,
+    fetch_scoreboard_nba_api,
+    get_team_sd,
+    get_today_games,
+    linear_marginal,
+    load_ratings,
+    normal_over_probs,
+    project_team_means,
+    redistribute_lost_usage,
+    simulate_prop_over_probs,
+    simulate_pts_props,
+)
+
 st.set_page_config(page_title="NBA Pro Monte Carlo Dashboard (Injury-aware)", layout="centered")
 st.title("🏀 NBA Pro Monte Carlo Betting Dashboard (Injury-aware)")
 
-# ---------------------------------------------------
-# Utility Functions
-# ---------------------------------------------------
-def american_to_profit(odds: int) -> float:
-    if odds > 0:
-        return odds / 100.0
-    return 100.0 / abs(odds)
-
-def calculate_ev(prob: float, odds: int) -> float:
-    profit = american_to_profit(odds)
-    return (prob * profit) - (1 - prob)
-
-def get_team_sd(mean_points: float) -> float:
-    base_sd = 11.0
-    return base_sd * (mean_points / 110.0)
-
 # ---------------------------------------------------
 # Load JSON Data
 # ---------------------------------------------------
 try:
-    with open("team_ratings.json") as f:
-        team_ratings = json.load(f)
+    team_ratings = load_ratings("team_ratings.json")
 except Exception as e:
     st.error(f"Error loading team_ratings.json: {e}")
     st.stop()
 
 try:
-    with open("player_ratings.json") as f:
-        player_ratings = json.load(f)
+    player_ratings = load_ratings("player_ratings.json")
 except Exception as e:
     st.error(f"Error loading player_ratings.json: {e}")
     st.stop()
 
-default_team = {"off": 114, "def": 114, "pace": 100, "volatility": 1.0}
+teams_df = build_teams_df(team_ratings)
+players_df = build_players_df(player_ratings)
 
 # ---------------------------------------------------
 # ---------------------------------------------------
@@ -136,71 +77,7 @@ except Exception:
 
 st.caption(f"Slate source: {source}")
 
-games = []
-game_meta = {}  # label -> metadata for later use
-
-if source == "nba_api":
-    game_objects = scoreboard.get("scoreboard", {}).get("games", [])
-    for g in game_objects:
-        home = g.get("homeTeam", {}).get("teamName")
-        away = g.get("awayTeam", {}).get("teamName")
-        status = g.get("gameStatusText", "")
-        if home and away:
-            label = f"{away} @ {home} ({status})"
-            games.append(label)
-            game_meta[label] = g
-
-elif source == "espn":
-    # ESPN format: events -> competitions -> competitors
-    for ev in scoreboard.get("events", []):
-        comps = ev.get("competitions", [])
-        if not comps:
-            continue
-
-        comp = comps[0]
-        competitors = comp.get("competitors", [])
-        if len(competitors) < 2:
-            continue
-
-        # Identify home/away
-        home_comp = next((c for c in competitors if c.get("homeAway") == "home"), None)
-        away_comp = next((c for c in competitors if c.get("homeAway") == "away"), None)
-        if not home_comp or not away_comp:
-            continue
-
-        home_abbr = home_comp.get("team", {}).get("abbreviation")
-        away_abbr = away_comp.get("team", {}).get("abbreviation")
-
-        home = ESPN_ABBR_TO_FULL.get(home_abbr, home_comp.get("team", {}).get("displayName"))
-        away = ESPN_ABBR_TO_FULL.get(away_abbr, away_comp.get("team", {}).get("displayName"))
-
-        # Status/time
-        status_text = ev.get("status", {}).get("type", {}).get("shortDetail") or ev.get("status", {}).get("type", {}).get("description", "")
-        # Start time in ISO
-        dt_str = comp.get("date", ev.get("date", ""))  # ISO
-        time_ct = ""
-        if dt_str:
-            try:
-                dt_str = dt_str.replace("Z", "+00:00")
-                dt_utc = datetime.fromisoformat(dt_str)
-                dt_ct = dt_utc.astimezone(central)
-                time_ct = dt_ct.strftime("%-I:%M %p CT")
-            except Exception:
-                time_ct = ""
-
-        # Prefer time if scheduled; otherwise status text (live/final)
-        label_tail = time_ct if time_ct else status_text
-        label = f"{away} @ {home} ({label_tail})"
-
-        games.append(label)
-        game_meta[label] = {
-            "homeTeam": {"teamName": home, "score": home_comp.get("score")},
-            "awayTeam": {"teamName": away, "score": away_comp.get("score")},
-            "statusText": status_text,
-            "startTime": dt_str,
-            "homeAbbr": home_abbr,
-            "awayAbbr": away_abbr,
-        }
+games, game_meta = get_today_games(source, scoreboard, central)
 
 if not games:
     st.warning("No games found for this date.")
@@ -217,27 +94,15 @@ away_team, home_team = selected_game_clean.split(" @ ")
 away_data = team_ratings.get(away_team, default_team)
 home_data = team_ratings.get(home_team, default_team)
 
-avg_pace = (away_data["pace"] + home_data["pace"]) / 2.0
-
-away_mean = (away_data["off"] / 114.0) * (home_data["def"] / 114.0) * 112.0
-home_mean = (home_data["off"] / 114.0) * (away_data["def"] / 114.0) * 112.0
-
-away_mean *= avg_pace / 100.0
-home_mean *= avg_pace / 100.0
-
-home_mean *= 1.025
-away_mean *= 0.975
+away_mean, home_mean = project_team_means(away_data, home_data)
 
 # ---------------------------------------------------
 # Players in this game
 # ---------------------------------------------------
-home_norm = normalize_team_name(home_team)
-away_norm = normalize_team_name(away_team)
-
-players_today = [
-    p for p, d in player_ratings.items()
-    if normalize_team_name(d.get("team")) in [home_norm, away_norm]
-]
+home_players, away_players, usage, player_team = build_usage_context(
+    home_team, away_team, "player_ratings.json", os.path.getmtime("player_ratings.json")
+)
+players_today = home_players + away_players
 
 if not players_today:
     st.error(f"No players found for {home_team} or {away_team}. Check player_ratings.json team names.")
@@ -293,68 +158,44 @@ st.caption("Out removes usage and redistributes to teammates. Limited reduces us
 # ---------------------------------------------------
 # Usage adjustment + redistribution
 # ---------------------------------------------------
-usage_map = {p: float(player_ratings[p].get("usage", 0.0)) for p in players_today}
-adjusted_usage = usage_map.copy()
-
-team_players_map = {}
-for p in players_today:
-    team_players_map.setdefault(player_ratings[p]["team"], []).append(p)
-
-def redistribute_lost_usage(team_players, usage_map_local, lost_usage):
-    current = np.array([usage_map_local.get(p, 0.0) for p in team_players], dtype=float)
-    total = float(current.sum())
-    if total <= 0:
-        per = lost_usage / max(1, len(team_players))
-        for p in team_players:
-            usage_map_local[p] = usage_map_local.get(p, 0.0) + per
-        return usage_map_local
-
-    shares = current / total
-    for p, share in zip(team_players, shares):
-        usage_map_local[p] = usage_map_local.get(p, 0.0) + lost_usage * float(share)
-    return usage_map_local
-
+# Fraction of usage each player keeps: 0 if Out, (1 - pct) if Limited
+keep = pd.Series(1.0, index=usage.index)
 for pname, settings in injury_settings.items():
-    if pname not in adjusted_usage:
+    if pname not in keep.index:
         continue
-
-    team = player_ratings[pname]["team"]
-    teammates = [x for x in team_players_map.get(team, []) if x != pname]
-
     if settings["status"] == "Out":
-        lost = adjusted_usage.get(pname, 0.0)
-        adjusted_usage[pname] = 0.0
-        if teammates and lost > 0:
-            adjusted_usage = redistribute_lost_usage(teammates, adjusted_usage, lost)
-
+        keep[pname] = 0.0
     elif settings["status"] == "Limited":
-        pct = float(settings.get("limited_pct", 0.0)) / 100.0
-        orig = adjusted_usage.get(pname, 0.0)
-        lost = orig * pct
-        adjusted_usage[pname] = orig * (1.0 - pct)
-        if teammates and lost > 0:
-            adjusted_usage = redistribute_lost_usage(teammates, adjusted_usage, lost)
-
-usage_df = pd.DataFrame([{
-    "Player": p,
-    "Team": player_ratings[p]["team"],
-    "Orig Usage": round(usage_map.get(p, 0.0), 3),
-    "Adj Usage": round(adjusted_usage.get(p, 0.0), 3),
-} for p in players_today])
+        keep[pname] = 1.0 - float(settings.get("limited_pct", 0.0)) / 100.0
+
+# Hand each team's lost usage to its healthy players in proportion to their usage
+# (equal split if they have none); injured players never receive any back.
+healthy = ~usage.index.isin(list(injury_settings))
+team_codes, team_names = pd.factorize(player_team)
+adjusted = pd.Series(
+    redistribute_lost_usage(
+        usage.to_numpy(dtype=float), keep.to_numpy(dtype=float), healthy, team_codes, len(team_names)
+    ),
+    index=usage.index,
+)
+
+adjusted_usage = adjusted.to_dict()
+
+usage_df = pd.DataFrame({
+    "Player": usage.index,
+    "Team": player_team.to_numpy(),
+    "Orig Usage": usage.round(3).to_numpy(),
+    "Adj Usage": adjusted.round(3).to_numpy(),
+})
 st.write("### Usage adjustments (original → adjusted)")
 st.dataframe(usage_df, width="stretch")
 
 st.divider()
 
 # ---------------------------------------------------
-# Correlated Monte Carlo Game Simulation
+# Correlated Game Markets (closed-form)
 # ---------------------------------------------------
-st.subheader("Game Market Simulator (correlated scores)")
-
-if "n_sims" not in st.session_state:
-    st.session_state.n_sims = 15000
-
-n_sims = st.slider("Simulation Runs", 5000, 50000, st.session_state.n_sims, step=5000, key="n_sims")
+st.subheader("Game Markets (correlated scores)")
 
 home_vol = float(home_data.get("volatility", 1.0))
 away_vol = float(away_data.get("volatility", 1.0))
@@ -362,16 +203,17 @@ away_vol = float(away_data.get("volatility", 1.0))
 home_sd = get_team_sd(home_mean) * home_vol
 away_sd = get_team_sd(away_mean) * away_vol
 rho = 0.30
-cov = [
-    [home_sd**2, rho * home_sd * away_sd],
-    [rho * home_sd * away_sd, away_sd**2]
-]
 
-samples = np.random.multivariate_normal([home_mean, away_mean], cov, n_sims)
-home_scores = samples[:, 0]
-away_scores = samples[:, 1]
-margins = home_scores - away_scores
-totals = home_scores + away_scores
+
+# Margin and total are linear combinations of a bivariate normal, so their
+# tail probabilities are closed-form; no sampling needed for game markets.
+score_means = np.array([home_mean, away_mean])
+score_cov = np.array([
+    [home_sd**2, rho * home_sd * away_sd],
+    [rho * home_sd * away_sd, away_sd**2],
+])
+mu_margin, sd_margin = linear_marginal([1, -1], score_means, score_cov)
+mu_total, sd_total = linear_marginal([1, 1], score_means, score_cov)
 
 market_type = st.selectbox("Market Type", ["Moneyline", "Spread", "Total"], key="market_type")
 
@@ -381,15 +223,17 @@ if "odds_input" not in st.session_state:
 if "spread_line" not in st.session_state:
     st.session_state.spread_line = -5.5
 if "total_line" not in st.session_state:
-    st.session_state.total_line = round(float(np.mean(totals)), 1)
+    st.session_state.total_line = round(float(mu_total), 1)
 
 odds_input = st.number_input("American Odds", value=int(st.session_state.odds_input), key="odds_input")
+if abs(odds_input) < 100:
+    st.error("American odds must be -100 or lower, or +100 or higher.")
 
 ev = 0.0
 
 if market_type == "Moneyline":
     side = st.radio("Select Side", ["Home", "Away"], key="ml_side")
-    home_prob = float(np.mean(margins > 0))
+    home_prob = float(normal_over_probs(mu_margin, sd_margin, 0))
     away_prob = 1.0 - home_prob
     prob = home_prob if side == "Home" else away_prob
     st.write(f"{side} Win Probability: **{prob*100:.2f}%**")
@@ -398,7 +242,7 @@ if market_type == "Moneyline":
 elif market_type == "Spread":
     spread_line = st.number_input("Spread Line (Home perspective)", value=float(st.session_state.spread_line), key="spread_line")
     side = st.radio("Select Side", ["Home", "Away"], key="spread_side")
-    home_cover_prob = float(np.mean(margins > spread_line))
+    home_cover_prob = float(normal_over_probs(mu_margin, sd_margin, spread_line))
     away_cover_prob = 1.0 - home_cover_prob
     prob = home_cover_prob if side == "Home" else away_cover_prob
     st.write(f"{side} Cover Probability: **{prob*100:.2f}%**")
@@ -407,7 +251,7 @@ elif market_type == "Spread":
 elif market_type == "Total":
     total_line = st.number_input("Total Line", value=float(st.session_state.total_line), key="total_line")
     side = st.radio("Select Side", ["Over", "Under"], key="total_side")
-    over_prob = float(np.mean(totals > total_line))
+    over_prob = float(normal_over_probs(mu_total, sd_total, total_line))
     under_prob = 1.0 - over_prob
     prob = over_prob if side == "Over" else under_prob
     st.write(f"{side} Probability: **{prob*100:.2f}%**")
@@ -423,142 +267,98 @@ st.divider()
 # ---------------------------------------------------
 st.subheader("Player Prop Batch Monte Carlo (injury-aware)")
 
-stat_choice = st.selectbox("Stat", ["pts", "reb", "ast", "3pm", "PRA"], key="stat_choice")
-
 if "prop_line" not in st.session_state:
     st.session_state.prop_line = 20.5
 if "prop_odds" not in st.session_state:
     st.session_state.prop_odds = -110
+if "n_sims" not in st.session_state:
+    st.session_state.n_sims = 15000
 
-prop_line = st.number_input("Sportsbook Line", value=float(st.session_state.prop_line), key="prop_line")
-prop_odds = st.number_input("American Odds (Prop)", value=int(st.session_state.prop_odds), key="prop_odds")
-
-b2b = st.checkbox("Back-to-Back Game?", key="b2b")
-
-results = []
-
-# Split players by team
-home_players = [p for p in players_today if player_ratings[p]["team"] == home_team]
-away_players = [p for p in players_today if player_ratings[p]["team"] == away_team]
+# Batch the prop inputs so typing a line/odds doesn't rerun the whole script per keystroke
+with st.form("prop_inputs"):
+    stat_choice = st.selectbox("Stat", ["pts", "reb", "ast", "3pm", "PRA"], key="stat_choice")
+
+    prop_line = st.number_input("Sportsbook Line", value=float(st.session_state.prop_line), key="prop_line")
+    prop_odds = st.number_input("American Odds (Prop)", value=int(st.session_state.prop_odds), key="prop_odds")
+
+    b2b = st.checkbox("Back-to-Back Game?", key="b2b")
+    analytic_props = st.checkbox("Use analytic CDF (fast)", value=True, key="analytic_props",
+                                 help="Non-PTS props are Normal(projection, SD), so P(over) is exact without sampling.")
+    n_sims = st.slider("PTS Simulation Runs", 5000, 50000, st.session_state.n_sims, step=5000, key="n_sims",
+                       help="Correlated game sims whose team scores are split across players for PTS props.")
+    # Independent props don't need the PTS sim's precision; ~5000 runs is already ±0.7% on P(over)
+    prop_n_sims = st.slider("Prop Sim Runs", 2000, 20000, 5000, step=1000, key="prop_n_sims",
+                            help="Only used for non-PTS props with the analytic CDF turned off.")
+    sim_seed = int(st.number_input("Random Seed", min_value=0, value=0, step=1, key="sim_seed",
+                                   help="Seeds the PTS and Monte Carlo prop simulations."))
+    st.form_submit_button("Update Props")
 
 # ---- TEAM-CONSTRAINED POINTS MODEL ----
 if stat_choice == "pts":
-    # Use your correlated game sim team scores as team points sims
-    home_team_points_sims = np.array(home_scores, dtype=float)
-    away_team_points_sims = np.array(away_scores, dtype=float)
-
-    # Optional: small noise so not ALL points must be explained by players in your JSON
-    # (bench + unknown players). This prevents weird over-allocation if your JSON is incomplete.
+    # Share of each simulated team score the players in your JSON must explain; the rest
+    # goes to bench + unknown players so an incomplete JSON doesn't over-allocate.
     # 0.85–0.95 works well depending on how complete your player list is.
     TEAM_POINTS_COVERAGE = 0.90
-    home_team_points_sims *= TEAM_POINTS_COVERAGE
-    away_team_points_sims *= TEAM_POINTS_COVERAGE
 
-    # Allocate each team's points to its players (negative correlation between teammates)
-    home_pts_matrix = team_constrained_points_sims(
-        home_team_points_sims, home_players, player_ratings, adjusted_usage, concentration=90
-    )
-    away_pts_matrix = team_constrained_points_sims(
-        away_team_points_sims, away_players, player_ratings, adjusted_usage, concentration=90
+    # Draws correlated team scores from the game sim and allocates each team's points
+    # to its players (negative correlation between teammates)
+    proj, prob_over = simulate_pts_props(
+        home_mean, away_mean, home_sd, away_sd, rho, n_sims, sim_seed,
+        home_players, away_players, player_ratings, adjusted_usage, prop_line,
+        coverage=TEAM_POINTS_COVERAGE, concentration=90,
     )
 
-    # Compute probs/EV for each player vs the sportsbook line
-    for idx, pname in enumerate(home_players):
-        sims = home_pts_matrix[:, idx]
-        prob_over = float(np.mean(sims >= prop_line))
-        prob_under = 1.0 - prob_over
-        ev_over = calculate_ev(prob_over, int(prop_odds))
-        ev_under = calculate_ev(prob_under, int(prop_odds))
-
-        results.append({
-            "Player": pname,
-            "Team": home_team,
-            "Orig Usage": round(float(usage_map.get(pname, 0.0)), 3),
-            "Adj Usage": round(float(adjusted_usage.get(pname, 0.0)), 3),
-            "Projection": round(float(np.mean(sims)), 2),
-            "Over %": round(prob_over * 100, 2),
-            "Under %": round(prob_under * 100, 2),
-            "EV Over": round(ev_over, 3),
-            "EV Under": round(ev_under, 3),
-        })
-
-    for idx, pname in enumerate(away_players):
-        sims = away_pts_matrix[:, idx]
-        prob_over = float(np.mean(sims >= prop_line))
-        prob_under = 1.0 - prob_over
-        ev_over = calculate_ev(prob_over, int(prop_odds))
-        ev_under = calculate_ev(prob_under, int(prop_odds))
-
-        results.append({
-            "Player": pname,
-            "Team": away_team,
-            "Orig Usage": round(float(usage_map.get(pname, 0.0)), 3),
-            "Adj Usage": round(float(adjusted_usage.get(pname, 0.0)), 3),
-            "Projection": round(float(np.mean(sims)), 2),
-            "Over %": round(prob_over * 100, 2),
-            "Under %": round(prob_under * 100, 2),
-            "EV Over": round(ev_over, 3),
-            "EV Under": round(ev_under, 3),
-        })
+    prop_players = home_players + away_players
+    prop_teams = [home_team] * len(home_players) + [away_team] * len(away_players)
 
 # ---- KEEP EXISTING (INDEPENDENT) MODEL FOR OTHER STATS FOR NOW ----
 else:
-    for player_name in players_today:
-        player = player_ratings[player_name]
-        team = player.get("team", "")
-        team_data = team_ratings.get(team, default_team)
-
-        base = float(player.get(stat_choice, 0))
-        u = float(adjusted_usage.get(player_name, float(player.get("usage", 0.0))))
-
-        # usage scaling by stat (your current logic)
-        if stat_choice == "ast":
-            proj = base * (1 + u * 0.7)
-        elif stat_choice == "reb":
-            proj = base * (1 + u * 0.25)
-        elif stat_choice == "3pm":
-            proj = base * (1 + u * 0.4)
-        elif stat_choice == "PRA":
-            proj = base * (1 + u * 0.6)
-        else:
-            proj = base
-
-        proj *= float(team_data.get("off", 114)) / 114.0
-        proj *= float(team_data.get("pace", 100)) / 100.0
-
-        if b2b:
-            proj *= 0.97
-
-        vol = float(team_data.get("volatility", 1.0))
-        if stat_choice == "3pm":
-            sd = 1.2 * vol
-        elif stat_choice == "ast":
-            sd = 2.2 * vol
-        elif stat_choice == "reb":
-            sd = 2.6 * vol
-        else:
-            sd = 3.2 * vol
-
-        sims = np.random.normal(proj, sd, n_sims)
-
-        prob_over = float(np.mean(sims >= prop_line))
-        prob_under = 1.0 - prob_over
-
-        ev_over = calculate_ev(prob_over, int(prop_odds))
-        ev_under = calculate_ev(prob_under, int(prop_odds))
-
-        results.append({
-            "Player": player_name,
-            "Team": team,
-            "Orig Usage": round(float(usage_map.get(player_name, 0.0)), 3),
-            "Adj Usage": round(float(adjusted_usage.get(player_name, 0.0)), 3),
-            "Projection": round(float(proj), 2),
-            "Over %": round(prob_over * 100, 2),
-            "Under %": round(prob_under * 100, 2),
-            "EV Over": round(ev_over, 3),
-            "EV Under": round(ev_under, 3),
-        })
-
-df = pd.DataFrame(results).sort_values(by="EV Over", ascending=False)
+    # Gather per-player inputs once as length-P vectors
+    prop_df = players_df.loc[players_today]
+    prop_teams = prop_df["team"].tolist()
+    prop_team_data = teams_df.reindex(prop_teams).fillna(default_team)
+
+    u = adjusted.loc[players_today].to_numpy(dtype=float)
+    off = prop_team_data["off"].to_numpy(dtype=float)
+    pace = prop_team_data["pace"].to_numpy(dtype=float)
+    vol = prop_team_data["volatility"].to_numpy(dtype=float)
+
+    # usage scaling + spread by stat (your current logic); PRA sums its component projections
+    proj = sum(
+        prop_df[comp].to_numpy(dtype=float) * (1 + u * STAT_USAGE_COEF.get(comp, 0.0))
+        for comp in STAT_COMPONENTS.get(stat_choice, (stat_choice,))
+    )
+    proj *= off / 114.0
+    proj *= pace / 100.0
+
+    if b2b:
+        proj *= 0.97
+
+    sd = STAT_SD.get(stat_choice, 3.2) * vol
+
+    prop_players = players_today
+    if analytic_props:
+        prob_over = normal_over_probs(proj, sd, prop_line)
+    else:
+        prob_over = simulate_prop_over_probs(proj, sd, prop_line, prop_n_sims, sim_seed)
+
+# Build the table column-wise straight from the per-player vectors
+prob_under = 1.0 - prob_over
+if abs(prop_odds) < 100:
+    st.error("Prop odds must be -100 or lower, or +100 or higher.")
+prop_profit = american_to_profit(int(prop_odds))  # odds are shared by every row
+ev_over = prob_over * prop_profit - prob_under
+ev_under = prob_under * prop_profit - prob_over
+df = pd.DataFrame({
+    "Player": prop_players,
+    "Team": prop_teams,
+    "Orig Usage": usage.reindex(prop_players).round(3).to_numpy(),
+    "Adj Usage": adjusted.reindex(prop_players).round(3).to_numpy(),
+    "Projection": proj.round(2),
+    "Over %": (prob_over * 100).round(2),
+    "Under %": (prob_under * 100).round(2),
+    "EV Over": ev_over.round(3),
+    "EV Under": ev_under.round(3),
+}).sort_values(by="EV Over", ascending=False)
 st.dataframe(df, width="stretch")
-st.caption("PTS uses team-constrained allocation (teammate negative correlation). Other stats still use independent sims (next upgrade).")
\ No newline at end of file
+st.caption("PTS uses team-constrained allocation (teammate negative correlation). Other stats use independent Normal projections (analytic CDF or sims).")
\ No newline at end of file